@@ -1,22 +1,402 @@
 """
 ETL script to migrate data from PostgreSQL to Neo4j.
 """
-from utils import wait_for_postgres, wait_for_neo4j, run_cypher, run_cypher_file
+from utils import wait_for_postgres, wait_for_neo4j, run_cypher_async, run_cypher_file, stream_rows, stream_arrow_rows, export_csv
+from utils import NEO4J_DRIVER_OPTIONS, PG_CONNECT_OPTIONS, timed, profile_query, print_profile
 
 import os
 import time
+import asyncio
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from neo4j import GraphDatabase
-import pandas as pd
+from neo4j import AsyncGraphDatabase, AsyncDriver, AsyncManagedTransaction
 from pathlib import Path
 from typing import List, Dict, Any, Iterator
 from datetime import datetime
 
+# Number of rows sent to Neo4j per UNWIND statement
+BATCH_SIZE = 10000
+
+# Maximum number of UNWIND batches in flight at once, across all phases.
+# Kept below the driver's connection pool size (NEO4J_DRIVER_OPTIONS).
+MAX_CONCURRENT_BATCHES = 32
+
+# SQL expression rendering a TIMESTAMPTZ `ts` column as a UTC ISO 8601 string
+# accepted by Cypher's datetime(), so no per-row conversion happens in Python
+TS_ISO = """to_char(ts AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"')"""
+
+# Directory shared with Neo4j's import/ folder, used for the LOAD CSV cold load
+NEO4J_IMPORT_DIR = Path(os.getenv("NEO4J_IMPORT_DIR", "/import"))
+
+
+async def cancel_all(tasks) -> None:
+    """Cancels the given tasks and waits until all of them have finished."""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _unwind_write(tx: AsyncManagedTransaction, query: str, rows: List[Dict[str, Any]]) -> None:
+    statement, profiled = profile_query(query)
+    result = await tx.run(statement, rows=rows)
+    summary = await result.consume()
+    if profiled:
+        print_profile(query, summary.profile)
+
+
+async def load_batches(driver: AsyncDriver, semaphore: asyncio.Semaphore, query: str, batches: Iterator[List[Dict[str, Any]]]) -> int:
+    """
+    Sends batches of rows to Neo4j as UNWIND statements instead of one statement per row.
+    
+    Each batch is written in its own managed transaction (retried on transient
+    errors) and several batches are kept in flight concurrently. The semaphore
+    is acquired before the next batch is fetched (in a worker thread, so the
+    event loop is not blocked), so at most a bounded number of batches is
+    held in memory. If a batch fails, no further batches are read or sent
+    and the batches still in flight are cancelled.
+    
+    Args:
+        driver: Async Neo4j driver instance
+        semaphore: Limits the number of batches in flight
+        query: Cypher query reading its rows from the $rows parameter
+        batches: Iterator of row batches, e.g. from stream_rows()
+    
+    Returns:
+        Number of rows sent
+    """
+    async def write(rows: List[Dict[str, Any]]) -> None:
+        async with driver.session() as session:
+            await session.execute_write(_unwind_write, query, rows)
+    
+    count = 0
+    tasks = set()
+    batches = iter(batches)
+    try:
+        while True:
+            await semaphore.acquire()
+            try:
+                # Stop reading the source as soon as a batch has failed
+                for task in [task for task in tasks if task.done()]:
+                    tasks.discard(task)
+                    if task.exception():
+                        raise task.exception()
+                batch = await asyncio.to_thread(next, batches, None)
+            except BaseException:
+                semaphore.release()
+                raise
+            if batch is None:
+                semaphore.release()
+                break
+            task = asyncio.create_task(write(batch))
+            # Released from a done callback, so cancelled batches free their slot too
+            task.add_done_callback(lambda _: semaphore.release())
+            tasks.add(task)
+            count += len(batch)
+        
+        await asyncio.gather(*tasks)
+    except BaseException:
+        await cancel_all(tasks)
+        raise
+    return count
+
+
+@timed('categories phase')
+async def load_categories(database_url: str, driver: AsyncDriver, semaphore: asyncio.Semaphore) -> Dict[str, int]:
+    """Loads Category nodes."""
+    print("  → Migrating Categories...")
+    count = await load_batches(driver, semaphore, """
+        UNWIND $rows AS r
+        MERGE (cat:Category {id: r.id})
+        SET cat.name = r.name
+    """, stream_arrow_rows(database_url, "SELECT id, name FROM categories", BATCH_SIZE))
+    print(f"  ✓ Migrated {count} categories")
+    return {'categories': count}
+
+
+@timed('products phase')
+async def load_products(database_url: str, driver: AsyncDriver, semaphore: asyncio.Semaphore) -> Dict[str, int]:
+    """Loads Product nodes and their IN_CATEGORY relationship, replacing a previous category."""
+    print("  → Migrating Products...")
+    count = await load_batches(driver, semaphore, """
+        UNWIND $rows AS r
+        MATCH (cat:Category {id: r.category_id})
+        MERGE (p:Product {id: r.id})
+        SET p.name = r.name,
+            p.price = r.price
+        WITH p, cat
+        OPTIONAL MATCH (p)-[old:IN_CATEGORY]->(other:Category)
+        WHERE other <> cat
+        DELETE old
+        WITH DISTINCT p, cat
+        MERGE (p)-[:IN_CATEGORY]->(cat)
+    """, stream_arrow_rows(database_url, "SELECT id, name, price::float8 AS price, category_id FROM products", BATCH_SIZE))
+    print(f"  ✓ Migrated {count} products")
+    return {'products': count}
+
+
+@timed('customers phase')
+async def load_customers(database_url: str, driver: AsyncDriver, semaphore: asyncio.Semaphore) -> Dict[str, int]:
+    """Loads Customer nodes."""
+    print("  → Migrating Customers...")
+    count = await load_batches(driver, semaphore, """
+        UNWIND $rows AS r
+        MERGE (c:Customer {id: r.id})
+        SET c.name = r.name,
+            c.join_date = date(r.join_date)
+    """, stream_arrow_rows(database_url, "SELECT id, name, join_date::text AS join_date FROM customers", BATCH_SIZE))
+    print(f"  ✓ Migrated {count} customers")
+    return {'customers': count}
+
+
+@timed('orders phase')
+async def load_orders(database_url: str, driver: AsyncDriver, semaphore: asyncio.Semaphore) -> Dict[str, int]:
+    """
+    Loads Order nodes with their PLACED and CONTAINS relationships.
+    
+    Orders are joined with their items in PostgreSQL, so each order is
+    matched once and its items are created in the same statement. A rerun
+    moves an order to its current customer and drops items that were
+    removed from it.
+    
+    The aggregated items do not fit the flat Arrow extraction, so this phase
+    streams them through a server-side cursor on its own connection.
+    """
+    print("  → Migrating Orders and Order Items...")
+    n_items = 0
+    pg_conn = await asyncio.to_thread(psycopg2.connect, database_url, **PG_CONNECT_OPTIONS)
+    
+    def count_items(batches: Iterator[List[Dict[str, Any]]]) -> Iterator[List[Dict[str, Any]]]:
+        nonlocal n_items
+        for batch in batches:
+            n_items += sum(len(row['items']) for row in batch)
+            yield batch
+    
+    try:
+        count = await load_batches(driver, semaphore, """
+            UNWIND $rows AS r
+            MATCH (c:Customer {id: r.customer_id})
+            MERGE (o:Order {id: r.id})
+            SET o.timestamp = datetime(r.ts)
+            WITH c, o, r
+            OPTIONAL MATCH (o)<-[old:PLACED]-(other:Customer)
+            WHERE other <> c
+            DELETE old
+            WITH DISTINCT c, o, r
+            MERGE (c)-[:PLACED]->(o)
+            WITH o, r.items AS items
+            OPTIONAL MATCH (o)-[old:CONTAINS]->(removed:Product)
+            WHERE NOT removed.id IN [item IN items | item.product_id]
+            DELETE old
+            WITH DISTINCT o, items
+            UNWIND items AS item
+            MATCH (p:Product {id: item.product_id})
+            MERGE (o)-[rel:CONTAINS]->(p)
+            SET rel.quantity = item.quantity
+        """, count_items(stream_rows(pg_conn, f"""
+            SELECT o.id, o.customer_id, {TS_ISO} AS ts,
+                   COALESCE(
+                       json_agg(json_build_object('product_id', oi.product_id, 'quantity', oi.quantity))
+                           FILTER (WHERE oi.order_id IS NOT NULL),
+                       '[]'
+                   ) AS items
+            FROM orders o
+            LEFT JOIN order_items oi ON oi.order_id = o.id
+            GROUP BY o.id, o.customer_id, o.ts
+        """, BATCH_SIZE)))
+    finally:
+        pg_conn.close()
+    print(f"  ✓ Created {count} orders")
+    print(f"  ✓ Created {n_items} order-product relationships")
+    return {'orders': count, 'order_items': n_items}
+
+
+@timed('events phase')
+async def load_events(database_url: str, driver: AsyncDriver, semaphore: asyncio.Semaphore) -> Dict[str, int]:
+    """
+    Loads customer events as INTERACTED relationships.
+    
+    Events repeat the same customers and products many times, so each batch
+    looks up every distinct customer and product once and resolves the
+    endpoints of each event from in-memory maps (requires APOC).
+    
+    Events are the largest table, so they are streamed through a server-side
+    cursor rather than read into memory at once by connectorx.
+    """
+    print("  → Migrating Customer Events...")
+    pg_conn = await asyncio.to_thread(psycopg2.connect, database_url, **PG_CONNECT_OPTIONS)
+    try:
+        count = await load_batches(driver, semaphore, """
+            UNWIND $rows AS r
+            WITH collect(DISTINCT r.customer_id) AS customer_ids,
+                 collect(DISTINCT r.product_id) AS product_ids
+            MATCH (c:Customer) WHERE c.id IN customer_ids
+            WITH product_ids, apoc.map.fromPairs(collect([c.id, c])) AS customers
+            MATCH (p:Product) WHERE p.id IN product_ids
+            WITH customers, apoc.map.fromPairs(collect([p.id, p])) AS products
+            UNWIND $rows AS r
+            WITH r, customers[r.customer_id] AS c, products[r.product_id] AS p
+            WHERE c IS NOT NULL AND p IS NOT NULL
+            MERGE (c)-[i:INTERACTED {id: r.id}]->(p)
+            SET i.event_type = r.event_type,
+                i.timestamp = datetime(r.ts)
+        """, stream_rows(pg_conn, f"SELECT id, customer_id, product_id, event_type, {TS_ISO} AS ts FROM events", BATCH_SIZE))
+    finally:
+        pg_conn.close()
+    print(f"  ✓ Created {count} interaction relationships")
+    return {'events': count}
+
+
+# ETL phases with the phases they depend on. Phases whose dependencies
+# are satisfied run concurrently.
+PHASES = {
+    'categories': (load_categories, set()),
+    'customers': (load_customers, set()),
+    'products': (load_products, {'categories'}),
+    'orders': (load_orders, {'customers', 'products'}),
+    'events': (load_events, {'customers', 'products'}),
+}
+
+
+async def run_phases(database_url: str, driver: AsyncDriver) -> Dict[str, int]:
+    """
+    Runs the ETL phases as a dependency graph on one event loop, starting each
+    phase as soon as all of its dependencies have finished.
+    
+    Args:
+        database_url: PostgreSQL connection string
+        driver: Async Neo4j driver instance shared by all phases
+    
+    Returns:
+        Number of rows loaded per entity
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+    tasks = {}
+    
+    async def run(name: str) -> Dict[str, int]:
+        loader, dependencies = PHASES[name]
+        await asyncio.gather(*(tasks[dependency] for dependency in dependencies))
+        return await loader(database_url, driver, semaphore)
+    
+    try:
+        # All tasks are created before any of them starts, so every dependency
+        # is already registered when a phase awaits it.
+        for name in PHASES:
+            tasks[name] = asyncio.create_task(run(name))
+        
+        counts = {}
+        for phase_counts in await asyncio.gather(*tasks.values()):
+            counts.update(phase_counts)
+        return counts
+    except BaseException:
+        # Stop the sibling phases, so none keeps writing after a failure
+        await cancel_all(tasks.values())
+        raise
+
+
+# Cold-load steps for an empty graph, in dependency order: the table name
+# (also the CSV file name), the PostgreSQL export query, and the LOAD CSV
+# query. Every CSV value is a string, so numbers are converted in Cypher.
+BULK_LOADS = [
+    ('categories', "SELECT id, name FROM categories", """
+        LOAD CSV WITH HEADERS FROM 'file:///categories.csv' AS row
+        CALL {
+            WITH row
+            CREATE (:Category {id: row.id, name: row.name})
+        } IN TRANSACTIONS OF 10000 ROWS
+    """),
+    ('products', "SELECT id, name, price, category_id FROM products", """
+        LOAD CSV WITH HEADERS FROM 'file:///products.csv' AS row
+        CALL {
+            WITH row
+            MATCH (cat:Category {id: row.category_id})
+            CREATE (p:Product {id: row.id, name: row.name, price: toFloat(row.price)})
+            CREATE (p)-[:IN_CATEGORY]->(cat)
+        } IN TRANSACTIONS OF 10000 ROWS
+    """),
+    ('customers', "SELECT id, name, join_date FROM customers", """
+        LOAD CSV WITH HEADERS FROM 'file:///customers.csv' AS row
+        CALL {
+            WITH row
+            CREATE (:Customer {id: row.id, name: row.name, join_date: date(row.join_date)})
+        } IN TRANSACTIONS OF 10000 ROWS
+    """),
+    ('orders', f"SELECT id, customer_id, {TS_ISO} AS ts FROM orders", """
+        LOAD CSV WITH HEADERS FROM 'file:///orders.csv' AS row
+        CALL {
+            WITH row
+            MATCH (c:Customer {id: row.customer_id})
+            CREATE (o:Order {id: row.id, timestamp: datetime(row.ts)})
+            CREATE (c)-[:PLACED]->(o)
+        } IN TRANSACTIONS OF 10000 ROWS
+    """),
+    ('order_items', "SELECT order_id, product_id, quantity FROM order_items", """
+        LOAD CSV WITH HEADERS FROM 'file:///order_items.csv' AS row
+        CALL {
+            WITH row
+            MATCH (o:Order {id: row.order_id})
+            MATCH (p:Product {id: row.product_id})
+            CREATE (o)-[:CONTAINS {quantity: toInteger(row.quantity)}]->(p)
+        } IN TRANSACTIONS OF 10000 ROWS
+    """),
+    ('events', f"SELECT id, customer_id, product_id, event_type, {TS_ISO} AS ts FROM events", """
+        LOAD CSV WITH HEADERS FROM 'file:///events.csv' AS row
+        CALL {
+            WITH row
+            MATCH (c:Customer {id: row.customer_id})
+            MATCH (p:Product {id: row.product_id})
+            CREATE (c)-[:INTERACTED {id: row.id, event_type: row.event_type, timestamp: datetime(row.ts)}]->(p)
+        } IN TRANSACTIONS OF 10000 ROWS
+    """),
+]
+
+
+async def is_graph_empty(driver: AsyncDriver) -> bool:
+    """Returns True if the Neo4j database contains no nodes."""
+    return not await run_cypher_async(driver, "MATCH (n) RETURN 1 LIMIT 1")
+
+
+@timed('bulk load')
+async def bulk_load(database_url: str, driver: AsyncDriver) -> Dict[str, int]:
+    """
+    Loads an empty graph by dumping each table to CSV in the shared import
+    directory and reading it server-side with LOAD CSV, which avoids sending
+    every row through Bolt.
+    
+    Args:
+        database_url: PostgreSQL connection string
+        driver: Async Neo4j driver instance
+    
+    Returns:
+        Number of rows loaded per table
+    """
+    counts = {}
+    pg_conn = await asyncio.to_thread(psycopg2.connect, database_url, **PG_CONNECT_OPTIONS)
+    try:
+        for table, sql, query in BULK_LOADS:
+            print(f"  → Bulk loading {table}...")
+            csv_path = NEO4J_IMPORT_DIR / f"{table}.csv"
+            try:
+                counts[table] = await asyncio.to_thread(export_csv, pg_conn, sql, csv_path)
+                # CALL { ... } IN TRANSACTIONS must run in an auto-commit
+                # transaction and is not PROFILEd; the timing below covers it
+                await run_cypher_async(driver, query, profile=False)
+            finally:
+                csv_path.unlink(missing_ok=True)
+            print(f"  ✓ Loaded {counts[table]} {table.replace('_', ' ')}")
+    finally:
+        pg_conn.close()
+    return counts
+
+
 def etl():
+    """Runs the ETL process from synchronous code (CLI, FastAPI background task)."""
+    asyncio.run(etl_async())
+
+
+async def etl_async():
 
-    wait_for_postgres()
-    wait_for_neo4j()
+    await asyncio.to_thread(wait_for_postgres)
+    await asyncio.to_thread(wait_for_neo4j)
 
     # Get path to your Cypher schema file
     queries_path = Path(__file__).with_name("queries.cypher")
@@ -31,155 +411,46 @@ def etl():
     print("Starting ETL Process: PostgreSQL → Neo4j")
     print("="*60 + "\n")
     
-    # Connect to databases
+    # Connect to Neo4j; phases read PostgreSQL through database_url
     print("Connecting to databases...")
-    pg_conn = psycopg2.connect(database_url)
-    neo4j_driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+    neo4j_driver = AsyncGraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password), **NEO4J_DRIVER_OPTIONS)
     
     try:
-        # Step 1: Clear existing Neo4j data and set up schema
-        print("\n[1/6] Clearing existing Neo4j data...")
-        run_cypher(neo4j_driver, "MATCH (n) DETACH DELETE n")
-        print("  ✓ Neo4j database cleared")
-        
-        # Execute schema setup if queries.cypher exists
+        # Step 1: Set up schema. The uniqueness constraints must exist before
+        # loading: they back the MERGE/MATCH lookups on id with an index.
+        # Existing data is not cleared; MERGE makes reruns idempotent and
+        # replaces stale categories, customers and order items, but rows
+        # deleted from PostgreSQL are left in the graph.
         if queries_path.exists():
-            print("\n[2/6] Setting up Neo4j schema...")
-            run_cypher_file(neo4j_driver, queries_path)
+            print("\n[1/2] Setting up Neo4j schema...")
+            await run_cypher_file(neo4j_driver, queries_path)
+            # Wait for newly created indexes to come online, otherwise the
+            # first batches fall back to label scans
+            await run_cypher_async(neo4j_driver, "CALL db.awaitIndexes(300)")
         else:
-            print("\n[2/6] No queries.cypher file found, skipping schema setup")
-        
-        # Step 2: Extract and Load Categories
-        print("\n[3/6] Migrating Categories...")
-        df_categories = pd.read_sql("SELECT * FROM categories", pg_conn)
-        print(f"  Found {len(df_categories)} categories")
-        
-        for _, row in df_categories.iterrows():
-            run_cypher(neo4j_driver, """
-                CREATE (cat:Category {
-                    id: $id,
-                    name: $name
-                })
-            """, {
-                'id': row['id'],
-                'name': row['name']
-            })
-        print(f"  ✓ Migrated {len(df_categories)} categories")
-        
-        # Step 3: Extract and Load Products with Category relationships
-        print("\n[4/6] Migrating Products...")
-        df_products = pd.read_sql("SELECT * FROM products", pg_conn)
-        print(f"  Found {len(df_products)} products")
-        
-        for _, row in df_products.iterrows():
-            run_cypher(neo4j_driver, """
-                MATCH (cat:Category {id: $category_id})
-                CREATE (p:Product {
-                    id: $id,
-                    name: $name,
-                    price: $price
-                })
-                CREATE (p)-[:IN_CATEGORY]->(cat)
-            """, {
-                'id': row['id'],
-                'name': row['name'],
-                'price': float(row['price']),
-                'category_id': row['category_id']
-            })
-        print(f"  ✓ Migrated {len(df_products)} products")
+            print("\n[1/2] No queries.cypher file found, skipping schema setup")
         
-        # Step 4: Extract and Load Customers
-        print("\n[5/6] Migrating Customers...")
-        df_customers = pd.read_sql("SELECT * FROM customers", pg_conn)
-        print(f"  Found {len(df_customers)} customers")
-        
-        for _, row in df_customers.iterrows():
-            run_cypher(neo4j_driver, """
-                CREATE (c:Customer {
-                    id: $id,
-                    name: $name,
-                    join_date: date($join_date)
-                })
-            """, {
-                'id': row['id'],
-                'name': row['name'],
-                'join_date': str(row['join_date'])
-            })
-        print(f"  ✓ Migrated {len(df_customers)} customers")
-        
-        # Step 5: Extract and Load Orders with relationships
-        print("\n[6/6] Migrating Orders and Order Items...")
-        df_orders = pd.read_sql("SELECT * FROM orders", pg_conn)
-        print(f"  Found {len(df_orders)} orders")
-        
-        # Create Order nodes and PLACED relationships
-        for _, row in df_orders.iterrows():
-            # Convert timestamp to ISO 8601 format for Neo4j
-            ts_iso = row['ts'].isoformat() if hasattr(row['ts'], 'isoformat') else str(row['ts'])
-            run_cypher(neo4j_driver, """
-                MATCH (c:Customer {id: $customer_id})
-                CREATE (o:Order {
-                    id: $id,
-                    timestamp: datetime($ts)
-                })
-                CREATE (c)-[:PLACED]->(o)
-            """, {
-                'id': row['id'],
-                'customer_id': row['customer_id'],
-                'ts': ts_iso
-            })
-        print(f"  ✓ Created {len(df_orders)} orders")
-        
-        # Load Order Items and create CONTAINS relationships
-        df_order_items = pd.read_sql("SELECT * FROM order_items", pg_conn)
-        print(f"  Found {len(df_order_items)} order items")
-        
-        for _, row in df_order_items.iterrows():
-            run_cypher(neo4j_driver, """
-                MATCH (o:Order {id: $order_id})
-                MATCH (p:Product {id: $product_id})
-                CREATE (o)-[:CONTAINS {quantity: $quantity}]->(p)
-            """, {
-                'order_id': row['order_id'],
-                'product_id': row['product_id'],
-                'quantity': int(row['quantity'])
-            })
-        print(f"  ✓ Created {len(df_order_items)} order-product relationships")
-        
-        # Step 6: Extract and Load Events (customer interactions)
-        print("\n[Bonus] Migrating Customer Events...")
-        df_events = pd.read_sql("SELECT * FROM events", pg_conn)
-        print(f"  Found {len(df_events)} events")
-        
-        for _, row in df_events.iterrows():
-            # Convert timestamp to ISO 8601 format for Neo4j
-            ts_iso = row['ts'].isoformat() if hasattr(row['ts'], 'isoformat') else str(row['ts'])
-            run_cypher(neo4j_driver, """
-                MATCH (c:Customer {id: $customer_id})
-                MATCH (p:Product {id: $product_id})
-                CREATE (c)-[:INTERACTED {
-                    event_type: $event_type,
-                    timestamp: datetime($ts)
-                }]->(p)
-            """, {
-                'customer_id': row['customer_id'],
-                'product_id': row['product_id'],
-                'event_type': row['event_type'],
-                'ts': ts_iso
-            })
-        print(f"  ✓ Created {len(df_events)} interaction relationships")
+        # Step 2: Extract and load all entities. An empty graph is cold-loaded
+        # with LOAD CSV when the import directory is shared with Neo4j;
+        # otherwise independent phases run in parallel with batched MERGE.
+        if NEO4J_IMPORT_DIR.is_dir() and await is_graph_empty(neo4j_driver):
+            print("\n[2/2] Bulk loading data into empty graph...")
+            counts = await bulk_load(database_url, neo4j_driver)
+        else:
+            print("\n[2/2] Migrating data...")
+            counts = await run_phases(database_url, neo4j_driver)
         
         # Summary
         print("\n" + "="*60)
         print("ETL Process Completed Successfully!")
         print("="*60)
         print(f"\nMigrated:")
-        print(f"  • {len(df_categories)} categories")
-        print(f"  • {len(df_products)} products")
-        print(f"  • {len(df_customers)} customers")
-        print(f"  • {len(df_orders)} orders")
-        print(f"  • {len(df_order_items)} order items")
-        print(f"  • {len(df_events)} customer events")
+        print(f"  • {counts['categories']} categories")
+        print(f"  • {counts['products']} products")
+        print(f"  • {counts['customers']} customers")
+        print(f"  • {counts['orders']} orders")
+        print(f"  • {counts['order_items']} order items")
+        print(f"  • {counts['events']} customer events")
         print("\nGraph structure created:")
         print("  • Category ← IN_CATEGORY ← Product")
         print("  • Customer → PLACED → Order → CONTAINS → Product")
@@ -192,8 +463,7 @@ def etl():
     
     finally:
         # Clean up connections
-        pg_conn.close()
-        neo4j_driver.close()
+        await neo4j_driver.close()
         print("Database connections closed.\n")
 
 
@@ -1,7 +1,7 @@
 // Neo4j Schema Setup
 // This file contains Cypher queries to set up constraints and indexes
 
-// Create uniqueness constraints
+// Create uniqueness constraints (their backing indexes serve the ETL's MERGE/MATCH on id)
 CREATE CONSTRAINT customer_id IF NOT EXISTS FOR (c:Customer) REQUIRE c.id IS UNIQUE;
 CREATE CONSTRAINT category_id IF NOT EXISTS FOR (cat:Category) REQUIRE cat.id IS UNIQUE;
 CREATE CONSTRAINT product_id IF NOT EXISTS FOR (p:Product) REQUIRE p.id IS UNIQUE;
@@ -1,12 +1,42 @@
 
 import os
+import re
+import csv
 import time
+import asyncio
+import threading
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from neo4j import GraphDatabase
-import pandas as pd
+import connectorx as cx
+from neo4j import GraphDatabase, Session, AsyncDriver, AsyncSession, AsyncManagedTransaction
+from neo4j.exceptions import ClientError
 from pathlib import Path
-from typing import List, Dict, Any, Iterator
+from typing import List, Dict, Any, Iterator, Sequence, Union, Tuple, Callable
+from itertools import groupby
+from functools import wraps
+
+# Connection settings shared by every long-lived Neo4j driver. The pool is
+# sized for the concurrent ETL batches, with a generous acquisition timeout
+# so bursts queue up instead of failing.
+NEO4J_DRIVER_OPTIONS = {
+    'max_connection_pool_size': 64,
+    'connection_acquisition_timeout': 120,
+    'connection_timeout': 15,
+    'keep_alive': True,
+}
+
+# TCP keepalive settings for PostgreSQL connections
+PG_CONNECT_OPTIONS = {
+    'keepalives': 1,
+    'keepalives_idle': 30,
+}
+
+# When set, each distinct Cypher query sent through run_cypher/run_cypher_async,
+# the ETL batches or the API's NDJSON streams is PROFILEd once and its plan printed
+DEBUG_PROFILE = os.getenv("DEBUG_PROFILE", "").lower() in ("1", "true", "yes")
+
+_profiled_queries = set()
+_profiled_queries_lock = threading.Lock()
 
 
 def wait_for_postgres(max_retries: int = 30, delay: int = 2) -> None:
@@ -69,29 +99,218 @@ def wait_for_neo4j(max_retries: int = 30, delay: int = 2) -> None:
                 raise Exception(f"Neo4j not ready after {max_retries} attempts") from e
 
 
-def run_cypher(driver: GraphDatabase.driver, query: str, parameters: Dict[str, Any] = None) -> List[Dict]:
+def timed(name: str) -> Callable:
+    """
+    Decorator printing how long a function (sync or async) took.
+    
+    Args:
+        name: Label printed with the timing
+    """
+    def decorator(fn: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    print(f"  ⏱ {name} took {time.perf_counter() - start:.3f}s")
+            return async_wrapper
+        
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                print(f"  ⏱ {name} took {time.perf_counter() - start:.3f}s")
+        return wrapper
+    return decorator
+
+
+def profile_query(query: str) -> Tuple[str, bool]:
+    """
+    Prefixes a query with PROFILE the first time it is seen, if DEBUG_PROFILE is set.
+    
+    Returns:
+        The query to run, and whether it will be profiled
+    """
+    if not DEBUG_PROFILE:
+        return query, False
+    with _profiled_queries_lock:
+        if query in _profiled_queries:
+            return query, False
+        _profiled_queries.add(query)
+    return f"PROFILE {query}", True
+
+
+def print_profile(query: str, profile: Dict[str, Any]) -> None:
+    """
+    Prints the operator tree of a PROFILEd query with rows and db hits per
+    operator, followed by the totals.
+    
+    Args:
+        query: The profiled query
+        profile: summary.profile of the query's result
+    """
+    def total(plan: Dict[str, Any], key: str) -> int:
+        return plan.get(key, 0) + sum(total(child, key) for child in plan.get('children', []))
+    
+    def walk(plan: Dict[str, Any], depth: int) -> None:
+        print(f"    {'  ' * depth}{plan.get('operatorType')}: rows={plan.get('rows', 0)} db_hits={plan.get('dbHits', 0)}")
+        for child in plan.get('children', []):
+            walk(child, depth + 1)
+    
+    print(f"  [PROFILE] {' '.join(query.split())[:120]}")
+    walk(profile, 0)
+    print(f"    total db_hits={total(profile, 'dbHits')} "
+          f"page_cache_hits={total(profile, 'pageCacheHits')} "
+          f"page_cache_misses={total(profile, 'pageCacheMisses')}")
+
+
+def run_cypher(driver: Union[GraphDatabase.driver, Session], query: str, parameters: Dict[str, Any] = None) -> List[Dict]:
     """
     Executes a single Cypher query.
     
     Args:
-        driver: Neo4j driver instance
+        driver: Neo4j driver instance, or an open session to reuse
         query: Cypher query string
         parameters: Optional parameters for the query
     
     Returns:
         List of result records as dictionaries
     """
-    with driver.session() as session:
-        result = session.run(query, parameters or {})
-        return [dict(record) for record in result]
+    if not isinstance(driver, Session):
+        with driver.session() as session:
+            return run_cypher(session, query, parameters)
+    
+    statement, profiled = profile_query(query)
+    result = driver.run(statement, parameters or {})
+    records = result.data()
+    if profiled:
+        print_profile(query, result.consume().profile)
+    return records
+
+
+def clear_graph(driver: Union[GraphDatabase.driver, Session], batch_size: int = 10000) -> None:
+    """
+    Deletes all nodes and relationships in bounded transactions, instead of a
+    single DETACH DELETE that holds the whole graph in one transaction.
+    
+    Uses apoc.periodic.iterate when APOC is installed, otherwise deletes
+    batch_size nodes per query until none are left.
+    
+    Args:
+        driver: Neo4j driver instance, or an open session to reuse
+        batch_size: Number of nodes deleted per transaction
+    """
+    try:
+        run_cypher(driver, """
+            CALL apoc.periodic.iterate('MATCH (n) RETURN n', 'DETACH DELETE n', {batchSize: $batch_size})
+        """, {'batch_size': batch_size})
+    except ClientError as e:
+        if e.code != "Neo.ClientError.Procedure.ProcedureNotFound":
+            raise
+        while run_cypher(driver, """
+            MATCH (n) WITH n LIMIT $batch_size
+            DETACH DELETE n
+            RETURN count(*) AS deleted
+        """, {'batch_size': batch_size})[0]['deleted'] > 0:
+            pass
 
 
-def run_cypher_file(driver: GraphDatabase.driver, file_path: Path) -> None:
+async def run_cypher_async(driver: Union[AsyncDriver, AsyncSession], query: str, parameters: Dict[str, Any] = None,
+                           profile: bool = True) -> List[Dict]:
     """
-    Executes multiple Cypher statements from a file.
+    Executes a single Cypher query with the async Neo4j driver.
     
     Args:
-        driver: Neo4j driver instance
+        driver: Async Neo4j driver instance, or an open async session to reuse
+        query: Cypher query string
+        parameters: Optional parameters for the query
+        profile: Whether the query may be PROFILEd when DEBUG_PROFILE is set
+    
+    Returns:
+        List of result records as dictionaries
+    """
+    if not isinstance(driver, AsyncSession):
+        async with driver.session() as session:
+            return await run_cypher_async(session, query, parameters, profile)
+    
+    statement, profiled = profile_query(query) if profile else (query, False)
+    result = await driver.run(statement, parameters or {})
+    records = await result.data()
+    if profiled:
+        print_profile(query, (await result.consume()).profile)
+    return records
+
+
+def split_cypher_statements(content: str) -> List[str]:
+    """
+    Splits a Cypher script into statements on top-level semicolons.
+    
+    Semicolons inside string literals, backtick-quoted names and comments
+    are ignored, and comments are dropped from the returned statements.
+    
+    Args:
+        content: Cypher script
+    
+    Returns:
+        Non-empty statements without their trailing semicolon
+    """
+    statements = []
+    current = []
+    i = 0
+    while i < len(content):
+        char = content[i]
+        if content.startswith('//', i):
+            end = content.find('\n', i)
+            i = len(content) if end == -1 else end
+            continue
+        if content.startswith('/*', i):
+            end = content.find('*/', i + 2)
+            i = len(content) if end == -1 else end + 2
+            continue
+        if char in '\'"`':
+            # Copy the quoted section verbatim, honouring backslash escapes
+            start = i
+            i += 1
+            while i < len(content) and content[i] != char:
+                i += 2 if content[i] == '\\' else 1
+            current.append(content[start:i + 1])
+            i += 1
+            continue
+        if char == ';':
+            statements.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    statements.append(''.join(current).strip())
+    return [statement for statement in statements if statement]
+
+
+def is_schema_statement(statement: str) -> bool:
+    """Returns True for CREATE/DROP CONSTRAINT and INDEX statements."""
+    return re.match(r'(CREATE|DROP)\s+(\w+\s+)?(CONSTRAINT|INDEX)\b', statement, re.IGNORECASE) is not None
+
+
+async def _run_statements(tx: AsyncManagedTransaction, statements: List[str]) -> None:
+    for statement in statements:
+        result = await tx.run(statement)
+        await result.consume()
+
+
+async def run_cypher_file(driver: AsyncDriver, file_path: Path) -> None:
+    """
+    Executes multiple Cypher statements from a file over a single session.
+    
+    Consecutive schema statements (constraints and indexes) are committed
+    together in one transaction; other statements run one at a time. All
+    statements run in managed transactions, so transient errors are retried.
+    
+    Args:
+        driver: Async Neo4j driver instance
         file_path: Path to the .cypher file
     """
     if not file_path.exists():
@@ -103,29 +322,97 @@ def run_cypher_file(driver: GraphDatabase.driver, file_path: Path) -> None:
     with open(file_path, 'r') as f:
         content = f.read()
     
-    # Split by semicolons and filter out empty statements
-    statements = [stmt.strip() for stmt in content.split(';') if stmt.strip()]
+    statements = split_cypher_statements(content)
     
-    with driver.session() as session:
-        for i, statement in enumerate(statements, 1):
+    async with driver.session() as session:
+        done = 0
+        for schema, group in groupby(statements, key=is_schema_statement):
+            group = list(group)
             try:
-                session.run(statement)
-                print(f"  ✓ Executed statement {i}/{len(statements)}")
+                if schema:
+                    await session.execute_write(_run_statements, group)
+                else:
+                    for statement in group:
+                        await session.execute_write(_run_statements, [statement])
+                done += len(group)
+                print(f"  ✓ Executed statements {done - len(group) + 1}-{done}/{len(statements)}")
             except Exception as e:
-                print(f"  ✗ Error in statement {i}: {e}")
+                print(f"  ✗ Error in statements {done + 1}-{done + len(group)}: {e}")
                 raise
 
 
-def chunk(dataframe: pd.DataFrame, chunk_size: int = 1000) -> Iterator[pd.DataFrame]:
+def chunk(rows: Sequence, chunk_size: int = 1000) -> Iterator[Sequence]:
     """
-    Splits a DataFrame into smaller chunks for batch processing.
+    Splits a list of records into smaller chunks for batch processing.
     
     Args:
-        dataframe: The DataFrame to split
+        rows: The sequence to split
         chunk_size: Number of rows per chunk
     
     Yields:
-        DataFrame chunks
+        Sequence chunks
+    """
+    for start in range(0, len(rows), chunk_size):
+        yield rows[start:start + chunk_size]
+
+
+def stream_rows(pg_conn: psycopg2.extensions.connection, sql: str, batch_size: int = 10000) -> Iterator[List[Dict]]:
+    """
+    Streams the result of a query in batches using a server-side cursor,
+    so only one batch is held in memory at a time.
+    
+    Args:
+        pg_conn: PostgreSQL connection
+        sql: SELECT query to run
+        batch_size: Number of rows fetched per round trip
+    
+    Yields:
+        Lists of rows as dictionaries
+    """
+    with pg_conn.cursor(name='etl_cur', cursor_factory=RealDictCursor) as cur:
+        cur.itersize = batch_size
+        cur.execute(sql)
+        while rows := cur.fetchmany(batch_size):
+            yield rows
+
+
+def stream_arrow_rows(database_url: str, sql: str, batch_size: int = 10000) -> Iterator[List[Dict]]:
     """
-    for start in range(0, len(dataframe), chunk_size):
-        yield dataframe.iloc[start:start + chunk_size]
\ No newline at end of file
+    Reads the result of a query into an Arrow table with connectorx and yields
+    it in batches, converting to dictionaries only one batch at a time.
+    
+    connectorx decodes rows natively into columnar buffers, skipping the
+    per-value Python objects psycopg2 creates. The whole result is held in
+    Arrow memory, so use stream_rows() for large tables that must be streamed.
+    
+    Args:
+        database_url: PostgreSQL connection string
+        sql: SELECT query to run
+        batch_size: Maximum number of rows per batch
+    
+    Yields:
+        Lists of rows as dictionaries
+    """
+    table = cx.read_sql(database_url, sql, return_type='arrow')
+    for batch in table.to_batches(max_chunksize=batch_size):
+        yield batch.to_pylist()
+
+
+def export_csv(pg_conn: psycopg2.extensions.connection, sql: str, file_path: Path) -> int:
+    """
+    Dumps the result of a query to a CSV file with a header row using COPY,
+    so rows are written by the server without going through Python objects.
+    
+    Args:
+        pg_conn: PostgreSQL connection
+        sql: SELECT query to export
+        file_path: Destination CSV file
+    
+    Returns:
+        Number of data rows written
+    """
+    with pg_conn.cursor() as cur, open(file_path, 'w', newline='') as f:
+        cur.copy_expert(f"COPY ({sql}) TO STDOUT WITH CSV HEADER", f)
+    
+    with open(file_path, newline='') as f:
+        return sum(1 for _ in csv.reader(f)) - 1